@@ -6,10 +6,11 @@ The **proj_flow.api.ctx** provides tools for preparing the project template.
 """
 
 import datetime
+import functools
 import inspect
 import os
 from dataclasses import dataclass
-from typing import Any, Callable, Dict, Iterable, List, Optional, Union, cast
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Union, cast
 
 from proj_flow.base import cmd
 from proj_flow.base import inspect as _inspect
@@ -32,6 +33,10 @@ class Setting:
     force_fix: bool = False
     project: Optional[str] = None
 
+    @functools.cached_property
+    def path_parts(self) -> Tuple[str, ...]:
+        return tuple(self.json_key.split("."))
+
     def calc_value(self, previous: SettingsType):
         if callable(self.value):
             kwargs = {}
@@ -8,23 +8,67 @@ steps.
 
 import fnmatch
 import os
+import re
 import sys
 from abc import abstractmethod
-from typing import List, cast
+from typing import Callable, Iterator, List, NamedTuple, Optional, Tuple, cast
 
 from proj_flow.api import env, init, step
 
 from . import api, win32
 
+Matcher = Callable[[str], Optional[re.Match]]
 
-def should_exclude(filename: str, exclude: List[str], config_os: str):
+
+class Exclude(NamedTuple):
+    suffixes: Tuple[str, ...]
+    matchers: List[Matcher]
+
+
+def _is_suffix_glob(pattern: str):
+    return pattern.startswith("*") and not any(c in pattern[1:] for c in "*?[")
+
+
+def compile_exclude(exclude: List[str]) -> Exclude:
+    patterns = [os.path.normcase(pattern) for pattern in exclude]
+    return Exclude(
+        suffixes=tuple(pattern[1:] for pattern in patterns if _is_suffix_glob(pattern)),
+        matchers=[
+            re.compile(fnmatch.translate(pattern)).match
+            for pattern in patterns
+            if not _is_suffix_glob(pattern)
+        ],
+    )
+
+
+def should_exclude(filename: str, exclude: Exclude, config_os: str):
     basename = os.path.splitext(filename)[0] if config_os == "windows" else filename
+    basename = os.path.normcase(basename)
+
+    if basename.endswith(exclude.suffixes):
+        return True
 
-    for pattern in exclude:
-        if fnmatch.fnmatch(basename, pattern):
-            return True
+    return any(match(basename) for match in exclude.matchers)
 
-    return False
+
+def _scan_files(top: str, recursive: bool) -> Iterator[os.DirEntry]:
+    stack = [top]
+    while stack:
+        try:
+            entries = os.scandir(stack.pop())
+        except OSError:
+            continue
+
+        with entries:
+            for entry in entries:
+                if entry.is_file():
+                    yield entry
+                elif (
+                    recursive
+                    and entry.is_dir(follow_symlinks=False)
+                    and entry.name != "__pycache__"
+                ):
+                    stack.append(entry.path)
 
 
 class SignBase(step.Step):
@@ -93,19 +137,17 @@ class SignFiles(SignBase):
     ) -> List[str]:
         cfg = cast(dict, rt._cfg.get("sign", {}))
         roots = cfg.get("directories", ["bin", "lib", "libexec", "share"])
-        exclude = cfg.get("exclude", ["*-test"])
+        exclude = compile_exclude(cfg.get("exclude", ["*-test"]))
 
         result: List[str] = []
         build_dir = config.build_dir
         for root in roots:
-            for curr_dir, _, filenames in os.walk(os.path.join(build_dir, root)):
-                for filename in filenames:
-                    if should_exclude(filename, exclude, config.os):
-                        continue
-
-                    full_path = os.path.join(curr_dir, filename)
-                    if tool.is_executable(full_path, as_package=False):
-                        result.append(full_path)
+            for entry in _scan_files(os.path.join(build_dir, root), recursive=True):
+                if should_exclude(entry.name, exclude, config.os):
+                    continue
+
+                if tool.is_executable(entry.path, as_package=False):
+                    result.append(entry.path)
         return result
 
 
@@ -130,21 +172,32 @@ class SignMsi(SignBase):
     ) -> List[str]:
         result: List[str] = []
         pkg_dir = os.path.join(config.build_dir, "packages")
-        for curr_dir, dirnames, filenames in os.walk(pkg_dir):
-            dirnames[:] = []
-            for filename in filenames:
-                full_path = os.path.join(curr_dir, filename)
-                if tool.is_executable(full_path, as_package=False):
-                    result.append(full_path)
+        for entry in _scan_files(pkg_dir, recursive=False):
+            if tool.is_executable(entry.path, as_package=True):
+                result.append(entry.path)
 
         return result
 
 
+_SIGNATURE_IGNORE = b"\n/signature.key\n"
+
+
 class SignInit(init.InitStep):
     def postprocess(self, rt: env.Runtime, context: dict):
-        if sys.platform == "win32":
-            with open(".gitignore", "ab") as ignoref:
-                ignoref.write("\n/signature.key\n".encode("UTF-8"))
+        if sys.platform != "win32":
+            return
+
+        try:
+            with open(".gitignore", "rb") as ignoref:
+                ignored = ignoref.read()
+        except FileNotFoundError:
+            ignored = b""
+
+        if b"/signature.key" in (line.strip() for line in ignored.splitlines()):
+            return
+
+        with open(".gitignore", "ab") as ignoref:
+            ignoref.write(_SIGNATURE_IGNORE)
 
 
 init.register_init_step(SignInit())
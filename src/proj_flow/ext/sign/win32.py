@@ -31,11 +31,11 @@ if sys.platform == "win32":
             rt.print("signtool", *(os.path.basename(file) for file in files))
             return _sign(files, rt)
 
-        def is_signable(self, filename: str, as_package: bool):
+        def is_executable(self, filename: str, as_package: bool):
             if as_package:
-                _, ext = os.path.splitext(filename)
-                return ext.lower() == ".msi"
-            return _is_pe_exec(filename)
+                return filename.lower().endswith(".msi")
+            _, ext = os.path.splitext(filename)
+            return ext.lower() in _PE_EXT and _is_pe_exec(filename)
 
     Version = Tuple[int, int, int]
 
@@ -88,6 +88,7 @@ if sys.platform == "win32":
             and _find_sign_tool(rt) is not None
         )
 
+    _PE_EXT = frozenset({".exe", ".dll", ".sys", ".ocx", ".cpl", ".scr"})
     _IMAGE_DOS_HEADER = "HHHHHHHHHHHHHH8sHH20sI"
     _IMAGE_NT_HEADERS_Signature = "H"
     _IMAGE_DOS_HEADER_size = struct.calcsize(_IMAGE_DOS_HEADER)
@@ -5,18 +5,45 @@
 The **proj_flow.flow.layer** supports :ref:`template` layers.
 """
 
+import functools
 import json
 import os
 import shutil
+import stat
 from dataclasses import dataclass
-from typing import List, Optional, cast
+from typing import Any, List, Optional, cast
 
 import chevron
+import chevron.tokenizer
 
 from proj_flow.api import ctx, env
 
+_SKIP_EXT = frozenset({".pyc", ".pyo", ".pyd"})
 
-@dataclass
+
+@functools.lru_cache(maxsize=1024)
+def _tokenize(template: str):
+    return tuple(chevron.tokenizer.tokenize(template))
+
+
+def _render(template: str, context: ctx.SettingsType) -> str:
+    return chevron.render(_tokenize(template), context)
+
+
+def _is_enabled(when: Optional[str], context: ctx.SettingsType):
+    if not when:
+        return True
+
+    scope: Any = context
+    for step in when.split("."):
+        if not isinstance(scope, dict) or step not in scope:
+            return False
+        scope = scope[step]
+
+    return bool(scope)
+
+
+@dataclass(slots=True)
 class FileInfo:
     src: str
     dst: str
@@ -27,25 +54,23 @@ class FileInfo:
     def from_json(cls, src: str, filelist: dict, context: ctx.SettingsType):
         basename, ext = os.path.splitext(src)
         is_mustache = ext == ".mustache"
-        key = src.replace(os.sep, "/")
-        json_file = cast(dict, filelist.get(key, {}))
+        json_file = cast(dict, filelist.get(src, {}))
         path = cast(Optional[str], json_file.get("path"))
         when = cast(Optional[str], json_file.get("when"))
         dst = (
-            chevron.render(path, context).replace("/", os.sep)
+            _render(path, context).replace("/", os.sep)
             if path is not None
             else basename if is_mustache else src
         )
         return cls(src=src, dst=dst, is_mustache=is_mustache, when=when)
 
-    def template(self):
-        open_mstch = "{{"
-        close_mstch = "}}"
-        if self.when:
-            return f"{open_mstch}#{self.when}{close_mstch}\n{self.dst}\n{open_mstch}/{self.when}{close_mstch}\n"
-        return f"{self.dst}\n"
-
-    def run(self, root: str, rt: env.Runtime, context: ctx.SettingsType):
+    def run(
+        self,
+        root: str,
+        rt: env.Runtime,
+        context: ctx.SettingsType,
+        dst: Optional[str] = None,
+    ):
         if not rt.silent:
             if rt.use_color:
                 print(f"\033[2;30m+\033[m {self.dst}")
@@ -55,23 +80,27 @@ class FileInfo:
             return
 
         src = os.path.join(root, self.src)
-        dst = os.path.abspath(self.dst)
-        dirname = os.path.dirname(dst)
-        os.makedirs(dirname, exist_ok=True)
+        if dst is None:
+            dst = os.path.abspath(self.dst)
+            os.makedirs(os.path.dirname(dst), exist_ok=True)
 
         if self.is_mustache:
-            with open(src, "rb") as inf:
-                content = inf.read().decode("UTF-8")
-            content = chevron.render(content, context)
-            with open(dst, "wb") as outf:
-                outf.write(content.encode("UTF-8"))
-            shutil.copymode(src, dst, follow_symlinks=False)
-            shutil.copystat(src, dst, follow_symlinks=False)
+            st = os.stat(src)
+            with open(src, encoding="UTF-8", newline="") as inf:
+                content = inf.read()
+            with open(dst, "w", encoding="UTF-8", newline="") as outf:
+                outf.write(chevron.render(content, context))
         else:
-            shutil.copy2(src, dst, follow_symlinks=False)
+            st = os.stat(src, follow_symlinks=False)
+            if stat.S_ISLNK(st.st_mode):
+                shutil.copy2(src, dst, follow_symlinks=False)
+                return
+            shutil.copyfile(src, dst)
+        os.chmod(dst, stat.S_IMODE(st.st_mode))
+        os.utime(dst, ns=(st.st_atime_ns, st.st_mtime_ns))
 
 
-@dataclass
+@dataclass(slots=True)
 class LayerInfo:
     root: str
     files: List[FileInfo]
@@ -81,38 +110,37 @@ class LayerInfo:
     def from_fs(cls, layer_dir: str, context: ctx.SettingsType):
         with open(f"{layer_dir}.json", encoding="UTF-8") as f:
             layer_info: dict = json.load(f)
-        when = cast(Optional[bool], layer_info.get("when"))
-        filelist = cast(dict, layer_info.get("filelist", {}))
+        when = cast(Optional[str], layer_info.get("when"))
+        if not _is_enabled(when, context):
+            return cls(root=layer_dir, files=[], when=when)
+
+        filelist = {
+            key.replace("/", os.sep): value
+            for key, value in cast(dict, layer_info.get("filelist", {})).items()
+        }
 
         sources: List[str] = []
-        prefix = os.path.join(layer_dir, "")
-        for curr_dir, dirs, files in os.walk(layer_dir):
-            dirs[:] = [dirname for dirname in dirs if dirname not in ["__pycache__"]]
-            files[:] = [
-                filename
-                for filename in files
-                if os.path.splitext(filename) not in [".pyc", ".pyo", ".pyd"]
-            ]
-
-            for filename in files:
-                src = os.path.join(curr_dir, filename)
-                if src.startswith(prefix):
-                    src = src[len(prefix) :]
-                sources.append(src)
+        prefix_len = len(os.path.join(layer_dir, ""))
+        stack = [layer_dir]
+        while stack:
+            with os.scandir(stack.pop()) as entries:
+                for entry in entries:
+                    if entry.is_dir():
+                        if not entry.is_symlink() and entry.name != "__pycache__":
+                            stack.append(entry.path)
+                        continue
+
+                    if os.path.splitext(entry.name)[1] in _SKIP_EXT:
+                        continue
+
+                    sources.append(entry.path[prefix_len:])
 
         files = [FileInfo.from_json(src, filelist, context) for src in sources]
+        if any("when" in json_file for json_file in filelist.values()):
+            files = [file for file in files if _is_enabled(file.when, context)]
         files.sort(key=lambda info: info.dst)
 
-        result = cls(root=layer_dir, files=files, when=when)
-        allowed_files = set(
-            filter(
-                lambda path: path != "",
-                chevron.render(result.template(), context).split("\n"),
-            )
-        )
-        result.files = list(filter(lambda file: file.dst in allowed_files, files))
-
-        return result
+        return cls(root=layer_dir, files=files, when=when)
 
     @property
     def name(self):
@@ -126,25 +154,21 @@ class LayerInfo:
             )
         )
 
-    def template(self):
-        open_mstch = "{{"
-        close_mstch = "}}"
-        result = ""
-        if self.when:
-            result += f"{open_mstch}#{self.when}{close_mstch}\n"
-        result += "".join(file.template() for file in self.files)
-        if self.when:
-            result += f"{open_mstch}/{self.when}{close_mstch}\n"
-        return result
-
     def run(self, rt: env.Runtime, context: ctx.SettingsType):
         if not rt.silent:
             if rt.use_color:
                 print(f"\033[2;30m[{self.pkg}:{self.name}]\033[m")
             else:
                 print(f"[{self.pkg}:{self.name}]")
-        for file in self.files:
-            file.run(self.root, rt, context)
+        cwd = os.getcwd()
+        targets = [
+            (file, os.path.normpath(os.path.join(cwd, file.dst))) for file in self.files
+        ]
+        if not rt.dry_run:
+            for dirname in {os.path.dirname(dst) for _, dst in targets}:
+                os.makedirs(dirname, exist_ok=True)
+        for file, dst in targets:
+            file.run(self.root, rt, context, dst=dst)
         if not rt.silent:
             print()
 
@@ -164,13 +188,18 @@ def copy_license(rt: env.Runtime, context: ctx.SettingsType):
 
 def gather_package_layers(package_root: str, context: ctx.SettingsType):
     layers_dir = os.path.abspath(os.path.join(package_root, ctx.template_dir, "layers"))
-    for root, dirs, files in os.walk(layers_dir):
-        layer_dirs = [
-            os.path.abspath(os.path.join(root, dirname))
-            for dirname in dirs
-            if f"{dirname}.json" in files
-        ]
-        dirs[:] = []
+    try:
+        with os.scandir(layers_dir) as it:
+            entries = list(it)
+    except FileNotFoundError:
+        entries = []
+
+    files = {entry.name for entry in entries if entry.is_file()}
+    layer_dirs = [
+        entry.path
+        for entry in entries
+        if entry.is_dir() and f"{entry.name}.json" in files
+    ]
 
     layers = (LayerInfo.from_fs(layer_dir, context) for layer_dir in layer_dirs)
     return list(filter(lambda layer: len(layer.files) > 0, layers))
@@ -5,9 +5,10 @@
 The **proj_flow.log.release** performs a relase on the hosting service.
 """
 
+import re
 import typing
 from abc import ABC, abstractmethod
-from typing import Iterable, Union
+from typing import Iterable, NamedTuple, Union
 
 from proj_flow import api
 from proj_flow.api import env
@@ -26,26 +27,46 @@ class VersionUpdater(ABC):
 version_updaters = registry.Registry[VersionUpdater]("VersionUpdater")
 
 
-def _bump_version(ver: str, level: commit.Level):
-    split = ver.split("-", 1)
-    if len(split) == 2:
-        stability = f"-{split[1]}"
-    else:
-        stability = ""
+_SEMVER = re.compile(
+    r"\s*(\d+)\s*(?:\.\s*(\d+)\s*)?(?:\.\s*(\d+)\s*)?(?:\.\s*\d+\s*)*(?:-(.*))?",
+    re.DOTALL,
+)
+
+
+class _SemVer(NamedTuple):
+    major: int
+    minor: int
+    patch: int
+    stability: str
+
+    @classmethod
+    def parse(cls, ver: str):
+        match = _SEMVER.fullmatch(ver)
+        if match is None:
+            raise ValueError(f"invalid version: {ver!r}")
+        major, minor, patch, stability = match.groups()
+        return cls(
+            int(major),
+            int(minor or 0),
+            int(patch or 0),
+            "" if stability is None else f"-{stability}",
+        )
+
+    def bump(self, level: commit.Level):
+        if level == commit.Level.BREAKING:
+            return self._replace(major=self.major + 1, minor=0, patch=0)
+        if level == commit.Level.FEATURE:
+            return self._replace(minor=self.minor + 1, patch=0)
+        if level == commit.Level.PATCH:
+            return self._replace(patch=self.patch + 1)
+        return self
+
+    def __str__(self):
+        return f"{self.major}.{self.minor}.{self.patch}{self.stability}"
 
-    semver = [int(s) for s in split[0].split(".")]
-    while len(semver) < 3:
-        semver.append(0)
-    semver = semver[:3]
 
-    if level.value > commit.Level.BENIGN.value:
-        # This turns [1, 2, 3] through 4 - x into [3, 2, 1]
-        lvl = commit.Level.BREAKING.value - level.value
-        semver[lvl] += 1
-        for index in range(lvl + 1, len(semver)):
-            semver[index] = 0
-
-    return ".".join(str(v) for v in semver) + stability
+def _bump_version(ver: str, level: commit.Level):
+    return str(_SemVer.parse(ver).bump(level))
 
 
 def _get_project(rt: env.Runtime):
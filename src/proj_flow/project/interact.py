@@ -7,7 +7,7 @@ user prompts.
 """
 
 from dataclasses import dataclass
-from typing import Callable, List, Optional, Union
+from typing import List, Optional, Tuple, Union
 
 from prompt_toolkit import prompt as tk_prompt
 from prompt_toolkit.completion import WordCompleter
@@ -134,17 +134,16 @@ def _project_filter(project: Optional[str]):
 
 
 def _prompt(
-    wanted: Callable[[ctx.Setting], bool], overrides: ctx.SettingsType
+    defaults: Tuple[ctx.Setting, ...],
+    switches: Tuple[ctx.Setting, ...],
+    overrides: ctx.SettingsType,
 ) -> ctx.SettingsType:
     settings: ctx.SettingsType = {}
 
-    defaults = [setting for setting in ctx.defaults if wanted(setting)]
-    switches = [setting for setting in ctx.switches if wanted(setting)]
-
     size = len(defaults) + len(switches)
     counter = 1
 
-    for coll in [defaults, switches]:
+    for coll in (defaults, switches):
         for setting in coll:
             loaded = _Question.load_default(
                 setting, settings, overrides.get(setting.json_key)
@@ -156,7 +155,11 @@ def _prompt(
     return settings
 
 
-def _all_default(wanted: Callable[[ctx.Setting], bool], overrides: ctx.SettingsType):
+def _all_default(
+    defaults: Tuple[ctx.Setting, ...],
+    switches: Tuple[ctx.Setting, ...],
+    overrides: ctx.SettingsType,
+):
     """
     Chooses default answers for all details of newly-crated project.
 
@@ -166,10 +169,7 @@ def _all_default(wanted: Callable[[ctx.Setting], bool], overrides: ctx.SettingsT
 
     settings: ctx.SettingsType = {}
 
-    defaults = [setting for setting in ctx.defaults if wanted(setting)]
-    switches = [setting for setting in ctx.switches if wanted(setting)]
-
-    for coll in [defaults, switches]:
+    for coll in (defaults, switches):
         for setting in coll:
             if setting.json_key in overrides:
                 settings[setting.json_key] = overrides[setting.json_key]
@@ -196,16 +196,18 @@ def _get_default(setting: ctx.Setting, settings: ctx.SettingsType):
     return value
 
 
-def _fixup_context(settings: ctx.SettingsType, wanted: Callable[[ctx.Setting], bool]):
-    defaults = [setting for setting in ctx.defaults if wanted(setting)]
-    hidden = [setting for setting in ctx.hidden if wanted(setting)]
-
+def _fixup_context(
+    settings: ctx.SettingsType,
+    defaults: Tuple[ctx.Setting, ...],
+    switches: Tuple[ctx.Setting, ...],
+    hidden: Tuple[ctx.Setting, ...],
+):
     for setting in hidden:
         value = _get_default(setting, settings)
         if isinstance(value, bool) or value != "":
             settings[setting.json_key] = value
 
-    for coll in [defaults, hidden]:
+    for coll in (defaults, hidden):
         for setting in coll:
             _fixup(settings, setting.json_key, setting.fix or "", setting.force_fix)
 
@@ -214,15 +216,21 @@ def _fixup_context(settings: ctx.SettingsType, wanted: Callable[[ctx.Setting], b
     except KeyError:
         pass
 
+    paths = {
+        setting.json_key: setting.path_parts
+        for coll in (defaults, switches, hidden)
+        for setting in coll
+    }
+
     result = {}
-    for key in settings:
-        path = key.split(".")
+    for key, value in settings.items():
+        path = paths.get(key) or tuple(key.split("."))
         path_ctx = result
         for step in path[:-1]:
             if step not in path_ctx or not isinstance(path_ctx[step], dict):
                 path_ctx[step] = {}
             path_ctx = path_ctx[step]
-        path_ctx[path[-1]] = settings[key]
+        path_ctx[path[-1]] = value
     return result
 
 
@@ -245,11 +253,16 @@ def get_context(interactive: bool, project: Optional[str], rt: env.Runtime):
     overrides = rt._cfg.get("defaults", {})
 
     wanted = _project_filter(project)
+    defaults = tuple(filter(wanted, ctx.defaults))
+    switches = tuple(filter(wanted, ctx.switches))
+    hidden = tuple(filter(wanted, ctx.hidden))
     return _fixup_context(
         (
-            _all_default(wanted, overrides)
+            _all_default(defaults, switches, overrides)
             if not interactive
-            else _prompt(wanted, overrides)
+            else _prompt(defaults, switches, overrides)
         ),
-        wanted,
+        defaults,
+        switches,
+        hidden,
     )